@@ -3,6 +3,7 @@
 import ok
 import hashlib
 import logging
+import numpy as np
 import struct
 import threading
 
@@ -41,6 +42,9 @@ class SquareWaveform(Waveform):
 
 class CustomWaveform(Waveform):
     def __init__(self, wave=None, clk_div=1, index=-1):
+        """
+        wave: sequence or numpy array of samples, unit: uA
+        """
         if wave is None:
             self.wave = []
         else:
@@ -369,9 +373,7 @@ class OSC1Lite:
             'Sending custom_waveform #%d, len=%d', data.index, len(data.wave))
         buff = b'csw\n'
         buff += struct.pack('<BBH', data.index, data.clk_div, len(data.wave))
-        for x in data.wave:
-            word = round(x / 20000 * 65536)
-            word_amp = 0 if word < 0 else 0xffff if word > 0xffff else word
-            buff += struct.pack('<H', word_amp)
+        word = np.round(np.asarray(data.wave, dtype=np.float64) / 20000 * 65536)
+        buff += np.clip(word, 0, 0xffff).astype('<u2').tobytes()
         with self.device_lock:
             self.dev.WriteToPipeIn(0x80, bytearray(buff))
@@ -1,9 +1,10 @@
 #! /usr/bin/env python3.5
 
+import collections
 import configparser
+from functools import partial
 import json
 import logging
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 import sys
@@ -22,6 +23,47 @@ logging.basicConfig(level=os.environ.get("LOGLEVEL", "DEBUG"))
 oscgui_config = configparser.ConfigParser()
 oscgui_config.read('config.ini')
 
+# Rise time (ms) of each SquareWaveform mode, and the thresholds for rounding
+# an arbitrary rise time to one of them
+rise_time_values = (0, .1, .5, 1, 2)
+rise_time_thresholds = np.array((.05, .3, .75, 1.5))
+
+
+class TextCtrlHandler(logging.Handler):
+    """Logging handler that appends records to a wx.TextCtrl.
+
+    Records may come from any thread. They are queued and written in one
+    batch on the GUI thread.
+    """
+
+    def __init__(self, text_ctrl: wx.TextCtrl, capacity=1000):
+        logging.Handler.__init__(self)
+        self.text_ctrl = text_ctrl
+        self._records = collections.deque(maxlen=capacity)
+        self._records_lock = threading.Lock()
+        self._flush_pending = False
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._records_lock:
+            self._records.append(msg)
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        wx.CallAfter(self._flush_records)
+
+    def _flush_records(self):
+        with self._records_lock:
+            msgs = list(self._records)
+            self._records.clear()
+            self._flush_pending = False
+        if msgs and self.text_ctrl:  # text_ctrl is falsy once destroyed
+            self.text_ctrl.AppendText('\n'.join(msgs) + '\n')
+
 
 class LabeledCtrl(wx.BoxSizer):
     def __init__(self, control, parent=None, ident=-1, label=''):
@@ -274,9 +316,8 @@ class SquareWavePanel(wx.FlexGridSizer):
         self.modify_callback = modify_callback
 
     def get_waveform(self) -> osc1lite.SquareWaveform:
-        mode = (0 if self.rise_time < .05 else
-                1 if self.rise_time < .3 else
-                2 if self.rise_time < .75 else 3 if self.rise_time < 1.5 else 4)
+        mode = int(np.searchsorted(rise_time_thresholds, self.rise_time,
+                                   side='right'))
         return osc1lite.SquareWaveform(amp=self.amp,
                                        pw=self.pulse_width / 1000,
                                        period=self.period / 1000,
@@ -347,9 +388,8 @@ class SquareWavePanel(wx.FlexGridSizer):
             self.rise_time_text.SetValue(str(self.rise_time))
             event.Skip()
             return
-        val = (0 if val < .05 else
-               .1 if val < .3 else
-               .5 if val < .75 else 1 if val < 1.5 else 2)
+        val = rise_time_values[
+            int(np.searchsorted(rise_time_thresholds, val, side='right'))]
         if self.rise_time != val:
             self.rise_time = val
             self.modify_callback()
@@ -368,7 +408,7 @@ class CustomWavePanel(wx.FlexGridSizer):
                  wx.EXPAND)
         self.Add(wx.StaticText(parent, -1, 'Sample Interval'), 0, wx.EXPAND)
 
-        self.wave = []
+        self.wave = np.zeros(0, dtype=np.float32)
         self.index = 0
         self.mf = mf
         try:
@@ -387,15 +427,24 @@ class CustomWavePanel(wx.FlexGridSizer):
         self.modify_callback = modify_callback
 
     def on_file(self, event: wx.Event):
+        threading.Thread(target=self.on_file_worker,
+                         args=(self.file_picker.GetPath(),)).start()
+
+    def on_file_worker(self, path: str):
         try:
-            with open(self.file_picker.GetPath()) as fp:
-                self.wave = [float(x) for x in fp.read().split()]
-        except ValueError:
+            wave = np.loadtxt(path, dtype=np.float32, ndmin=1).ravel()
+        except (OSError, ValueError):
+            wave = None
+        wx.CallAfter(self.on_file_loaded, wave)
+
+    def on_file_loaded(self, wave):
+        if wave is None:
             wx.MessageBox(
                     'Error parsing cwave file. Please check file format.',
                     'Error', wx.ICON_ERROR | wx.OK | wx.CENTRE)
             self.file_picker.SetPath('')
-        if 0 < len(self.wave) <= osc1lite.custom_waveform_max_len:
+        elif 0 < len(wave) <= osc1lite.custom_waveform_max_len:
+            self.wave = wave
             self.modify_callback()
             self.send_custom_waveform()
         else:
@@ -418,7 +467,7 @@ class CustomWavePanel(wx.FlexGridSizer):
 
     def send_custom_waveform(self):
         wf = self.get_waveform()
-        if wf.wave and self.mf.device:
+        if len(wf.wave) and self.mf.device:
             self.mf.device.send_custom_waveform(wf)
 
 
@@ -449,9 +498,9 @@ class WaveFormPanel(wx.StaticBoxSizer):
         self.num_of_pulses = wx.SpinCtrl(p, -1, min=1, max=0xffff,
                                          value=str(n_pulses),
                                          style=wx.TE_PROCESS_ENTER)
-        self.num_of_pulses.Bind(wx.EVT_SPINCTRL,
-                                lambda _: modify_callback(self.label))
+        self.num_of_pulses.Bind(wx.EVT_SPINCTRL, lambda _: self.on_modified())
         self.num_of_pulses.Bind(wx.EVT_TEXT_ENTER, self.on_num_of_pulses)
+        self.num_of_pulses.Bind(wx.EVT_TEXT, self.on_num_of_pulses_text)
         self.num_of_pulses.SetToolTip('Range: 1~65535')
 
         common.Add(
@@ -465,9 +514,9 @@ class WaveFormPanel(wx.StaticBoxSizer):
         self.delete_button.SetToolTip(wx.ToolTip('Delete waveform'))
         common.Add(self.delete_button, 0, wx.ALIGN_TOP | wx.ALL, 3)
         self.Add(common, 0, wx.EXPAND)
-        self.p_square = SquareWavePanel(p, lambda: modify_callback(self.label),
+        self.p_square = SquareWavePanel(p, self.on_modified,
                                         init_dict=init_dict)
-        self.p_custom = CustomWavePanel(p, lambda: modify_callback(self.label), self.parent.mf,
+        self.p_custom = CustomWavePanel(p, self.on_modified, self.parent.mf,
                                         init_dict=init_dict)
         self.Add(self.p_square, 0, wx.EXPAND | wx.ALL, 3)
         self.Add(self.p_custom, 0, wx.EXPAND | wx.ALL, 3)
@@ -476,15 +525,30 @@ class WaveFormPanel(wx.StaticBoxSizer):
         self.detail = self.p_square
         self.modify_callback = modify_callback
         p.SetFont(font)
+        self.preview_frame = None  # Created on first preview
+        self._cached_info = None
+
+    def on_modified(self):
+        self._cached_info = None
+        self.modify_callback(self.label)
 
     def on_num_of_pulses(self, event: wx.Event):
         self.num_of_pulses.SetValue(self.num_of_pulses.GetValue())
-        self.modify_callback(self.label)
+        self.on_modified()
+        event.Skip()
+
+    def on_num_of_pulses_text(self, event: wx.Event):
+        # channel_info() reads the live value, so drop the cache even if the
+        # edit has not been committed yet
+        self._cached_info = None
         event.Skip()
 
     def channel_info(self) -> osc1lite.ChannelInfo:
-        wf = self.detail.get_waveform()
-        return osc1lite.ChannelInfo(wf, n_pulses=self.num_of_pulses.GetValue())
+        if self._cached_info is None:
+            wf = self.detail.get_waveform()
+            self._cached_info = osc1lite.ChannelInfo(
+                wf, n_pulses=self.num_of_pulses.GetValue())
+        return self._cached_info
 
     def to_dict(self) -> dict:
         ret = {'label': self.label,
@@ -503,34 +567,63 @@ class WaveFormPanel(wx.StaticBoxSizer):
                     'Preview for ' + self.label)
                 return
             else:
-                xs = [0]
-                for i in range(n_pulses):
-                    x_offset = xs[-1]
-                    rise_time = (0, 0.1, 0.5, 1, 2)[wf.mode]
-                    xs.extend((x_offset + rise_time,
-                               x_offset + wf.pulse_width * 1000 - rise_time,
-                               x_offset + wf.pulse_width * 1000,
-                               x_offset + wf.period * 1000))
+                rise_time = rise_time_values[wf.mode]
+                x_offset = np.arange(n_pulses) * (wf.period * 1000)
+                xs = np.append(0, (x_offset[:, None] + np.array(
+                    (rise_time, wf.pulse_width * 1000 - rise_time,
+                     wf.pulse_width * 1000, wf.period * 1000))).ravel())
                 ys = np.append(np.tile([0, wf.amp, wf.amp, 0], n_pulses), 0)
         elif isinstance(wf, osc1lite.CustomWaveform):
             xs = np.arange(n_pulses * len(wf.wave)) * wf.clk_div *0.017152
             ys = np.tile(wf.wave, n_pulses)
         else:
             raise TypeError('Waveform type not supported')
-        plt.figure(num='Preview for ' + self.label)
-        plt.plot(xs, ys, label=self.label)
-        plt.xlabel('time (ms)')
-        plt.ylabel('amplitude (\u03bcA)')
-        plt.show()
+        if self.preview_frame is None:
+            self.create_preview_frame()
+        self._preview_line.set_data(xs, ys)
+        self._preview_ax.relim()
+        self._preview_ax.autoscale()
+        self._preview_toolbar.update()  # Reset zoom history
+        self._preview_canvas.draw_idle()
+        self.preview_frame.Show()
+        self.preview_frame.Raise()
+
+    def create_preview_frame(self):
+        # matplotlib is imported here so that startup does not pay for it
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_wxagg import (
+            FigureCanvasWxAgg, NavigationToolbar2WxAgg)
+
+        frame = wx.Frame(self.parent.mf, -1, 'Preview for ' + self.label)
+        fig = Figure()
+        self._preview_ax = fig.add_subplot(111)
+        self._preview_ax.set_xlabel('time (ms)')
+        self._preview_ax.set_ylabel('amplitude (\u03bcA)')
+        self._preview_line, = self._preview_ax.plot([], [], label=self.label)
+        self._preview_canvas = FigureCanvasWxAgg(frame, -1, fig)
+        self._preview_toolbar = NavigationToolbar2WxAgg(self._preview_canvas)
+        self._preview_toolbar.Realize()
+        box = wx.BoxSizer(wx.VERTICAL)
+        box.Add(self._preview_canvas, 1, wx.EXPAND)
+        box.Add(self._preview_toolbar, 0, wx.EXPAND)
+        frame.SetSizerAndFit(box)
+        # Only hide the frame on close, so the figure is reused next time
+        frame.Bind(wx.EVT_CLOSE, lambda _: frame.Hide())
+        self.preview_frame = frame
+
+    def destroy_preview_frame(self):
+        if self.preview_frame is not None:
+            self.preview_frame.Destroy()
+            self.preview_frame = None
 
     def on_type(self, event: wx.Event):
         obj = event.GetEventObject()
         assert isinstance(obj, wx.Choice)
         if obj.GetSelection() == 0:  # Square Wave
+            self.parent.Freeze()
             self.Hide(self.p_custom)
             self.p_custom.index = 0
             self.Show(self.p_square)
-            self.Layout()
             self.detail = self.p_square
         else:
             custom_index = self.parent.get_available_custom_index()
@@ -541,13 +634,14 @@ class WaveFormPanel(wx.StaticBoxSizer):
                         'Error', wx.ICON_ERROR | wx.OK | wx.CENTRE, self.parent.mf)
                 obj.SetSelection(0)  # Set selection back to Square wave
                 return
+            self.parent.Freeze()
             self.Hide(self.p_square)
             self.p_custom.index = custom_index
             self.Show(self.p_custom)
-            self.Layout()
             self.detail = self.p_custom
         self.parent.Layout()
-        self.modify_callback(self.label)
+        self.parent.Thaw()
+        self.on_modified()
 
 
 class WaveformManager(wx.ScrolledWindow):
@@ -564,37 +658,34 @@ class WaveformManager(wx.ScrolledWindow):
         self.box.Add(new_wf, wx.SizerFlags().Right())
 
         self.cnt = 4
-        self.waveform_panels = [WaveFormPanel(self, 'Waveform %d' % (x + 1),
-                                              mf.set_wf_modified)
-                                for x in range(self.cnt)]
-        for wf in self.waveform_panels:
-            self.box.Add(wf, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+        self.waveform_panels = []
+        for x in range(self.cnt):
+            self.add_panel(WaveFormPanel(self, 'Waveform %d' % (x + 1),
+                                         mf.set_wf_modified))
 
         self.SetSizerAndFit(self.box)
         # self.box.SetSizeHints(self)
         self.SetScrollRate(5, 5)
 
-        self.Bind(wx.EVT_BUTTON, self.on_delete)
+    def add_panel(self, wf: 'WaveFormPanel'):
+        self.waveform_panels.append(wf)
+        wf.delete_button.Bind(wx.EVT_BUTTON, partial(self.on_delete, panel=wf))
+        self.box.Add(wf, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
 
-    def on_delete(self, event: wx.Event):
-        ident = event.GetId()
-        obj = event.GetEventObject()
-        assert isinstance(obj, wx.Button)
-        for idx, x in enumerate(self.waveform_panels):
-            if ident == x.delete_button.GetId():
-                ch = self.mf.is_wf_using(x.label)
-                if ch != -1:
-                    wx.MessageBox(
-                        'Cannot delete waveform.\n'
-                        'Waveform is being used by channel %d.' % ch,
-                        'Error', wx.ICON_ERROR | wx.OK | wx.CENTRE, self.mf)
-                    return
-                self.parent.Freeze()
-                del self.waveform_panels[idx]
-                self.box.Detach(x)
-                x.GetStaticBox().DestroyChildren()
-                x.Destroy()
-                break
+    def on_delete(self, event: wx.Event, panel: 'WaveFormPanel'):
+        ch = self.mf.is_wf_using(panel.label)
+        if ch != -1:
+            wx.MessageBox(
+                'Cannot delete waveform.\n'
+                'Waveform is being used by channel %d.' % ch,
+                'Error', wx.ICON_ERROR | wx.OK | wx.CENTRE, self.mf)
+            return
+        self.parent.Freeze()
+        self.waveform_panels.remove(panel)
+        self.box.Detach(panel)
+        panel.destroy_preview_frame()
+        panel.GetStaticBox().DestroyChildren()
+        panel.Destroy()
         self.mf.update_wf_list()
         self.parent.Layout()
         self.parent.Thaw()
@@ -603,6 +694,7 @@ class WaveformManager(wx.ScrolledWindow):
         self.parent.Freeze()
         for x in self.waveform_panels:
             self.box.Detach(x)
+            x.destroy_preview_frame()
             x.GetStaticBox().DestroyChildren()
             x.Destroy()
         self.waveform_panels = []
@@ -614,10 +706,8 @@ class WaveformManager(wx.ScrolledWindow):
                     self.cnt = max(self.cnt, int(x['label'][9:]))
                 except ValueError:
                     pass
-            wf = WaveFormPanel(self, x['label'], self.mf.set_wf_modified,
-                               init_dict=x)
-            self.waveform_panels.append(wf)
-            self.box.Add(wf, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+            self.add_panel(WaveFormPanel(self, x['label'],
+                                         self.mf.set_wf_modified, init_dict=x))
         self.box.SetSizeHints(self)
         self.mf.update_wf_list()
         self.parent.Layout()
@@ -626,10 +716,8 @@ class WaveformManager(wx.ScrolledWindow):
     def on_new_wf(self, event: wx.Event):
         self.parent.Freeze()
         self.cnt += 1
-        wf = WaveFormPanel(
-            self, 'Waveform %d' % self.cnt, self.mf.set_wf_modified)
-        self.waveform_panels.append(wf)
-        self.box.Add(wf, 0, wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
+        self.add_panel(WaveFormPanel(
+            self, 'Waveform %d' % self.cnt, self.mf.set_wf_modified))
         self.box.SetSizeHints(self)
         self.mf.update_wf_list()
         self.parent.Layout()
@@ -647,28 +735,53 @@ class WaveformManager(wx.ScrolledWindow):
 
 class MainFrame(wx.Frame):
     daemon_lock = threading.RLock()
+    poll_interval_min = 0.1  # s
+    poll_interval_max = 2.0  # s
 
     def daemon(self) -> None:
         logging.getLogger('OSCGUI').debug('daemon started')
-        while True:
-            with self.daemon_lock:
+        with self._state_cv:
+            while not self._stop_evt.is_set():
                 if self.device is None:
                     self.device_lister()
                 else:
                     self.device_watcher()
-            time.sleep(0.1)
+                # Releases daemon_lock until timeout or wake_daemon()
+                self._state_cv.wait(self._poll_interval)
+        logging.getLogger('OSCGUI').debug('daemon stopped')
+
+    def wake_daemon(self) -> None:
+        with self._state_cv:
+            self._state_cv.notify_all()
+
+    def reset_poll_interval(self) -> None:
+        self._idle_polls = 0
+        self._poll_interval = self.poll_interval_min
 
     def device_lister(self) -> None:
-        devices = {}
         self._dev = ok.okCFrontPanel()
-        for i in range(self._dev.GetDeviceCount()):
-            model = self._dev.GetDeviceListModel(i)
-            serial = self._dev.GetDeviceListSerial(i)
-            if model and serial:
-                devices[serial] = model
-            else:
-                break
-        if devices != self.devices:
+        count = self._dev.GetDeviceCount()
+        if count == self._last_count and count == len(self.devices):
+            # No device plugged or unplugged, skip the enumeration
+            devices = self.devices
+        else:
+            self._last_count = count
+            devices = {}
+            for i in range(count):
+                model = self._dev.GetDeviceListModel(i)
+                serial = self._dev.GetDeviceListSerial(i)
+                if model and serial:
+                    devices[serial] = model
+                else:
+                    break
+        if devices == self.devices:
+            # Back off while the device list stays the same
+            self._idle_polls += 1
+            self._poll_interval = min(
+                self.poll_interval_max,
+                self.poll_interval_min * 2 ** (self._idle_polls // 10))
+        else:
+            self.reset_poll_interval()
             self.devices = devices
             curr = self.device_choice.GetStringSelection()
             if devices:
@@ -697,23 +810,32 @@ class MainFrame(wx.Frame):
                    self.channels_ui[x].trigger == 1 or
                    not self.channels_ui[x].continuous]
         channel_warnings = [[] for _ in range(16)]
+        reported = []
         for x, chs in warn.items():
             for ch in chs:
-                logging.getLogger('OSCGUI').debug(
-                    'Board reported: [Channel %d] %s' % (ch, x))
+                reported.append('[Channel %d] %s' % (ch, x))
                 channel_warnings[ch].append(x)
+        if reported:
+            logging.getLogger('OSCGUI').debug(
+                'Board reported: %s', '; '.join(reported))
+        alerts = []
+        back_to_normal = []
         for ch, x in enumerate(channel_warnings):
             if ch >= 12:
                 continue
             if x != self.channels_ui[ch].warnings:
                 self.channels_ui[ch].warnings = x
                 if x:
-                    logging.getLogger('OSCGUI').warning(
-                        '%s alerts: %s' % (self.channels_ui[ch].channel_name,
-                                           ', '.join(x)))
+                    alerts.append('%s: %s' % (self.channels_ui[ch].channel_name,
+                                              ', '.join(x)))
                 else:
-                    logging.getLogger('OSCGUI').info(
-                        '%s back to normal' % self.channels_ui[ch].channel_name)
+                    back_to_normal.append(self.channels_ui[ch].channel_name)
+        if alerts:
+            logging.getLogger('OSCGUI').warning(
+                'Channel alerts: %s', '; '.join(alerts))
+        if back_to_normal:
+            logging.getLogger('OSCGUI').info(
+                'Channel(s) back to normal: %s', ', '.join(back_to_normal))
 
         status = self.device.status()
         for ch in range(12):
@@ -747,8 +869,14 @@ class MainFrame(wx.Frame):
         wx.Frame.__init__(
             self, parent, ident,
             'OSC1Lite Stimulate GUI v' + __version__)
+        self.Freeze()
         self.device = None
         self.devices = {}
+        self._last_count = -1
+        self._stop_evt = threading.Event()
+        self._state_cv = threading.Condition(self.daemon_lock)
+        self._idle_polls = 0
+        self._poll_interval = self.poll_interval_min
 
         self.board_relative_controls = []
 
@@ -833,48 +961,41 @@ class MainFrame(wx.Frame):
                                         choices=['Waveform %d' % (x + 1) for x
                                                  in range(4)])
             waveform_choice.SetSelection(0)
-            wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-            wrap_box.Add(waveform_choice, 1, wx.ALIGN_CENTER_VERTICAL)
-            channel_box.Add(wrap_box, 0, wx.EXPAND)
+            channel_box.Add(waveform_choice, 0,
+                            wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             trigger_choice = wx.Choice(p, -1, choices=['PC trigger',
                                                        'External trigger'])
             trigger_choice.SetSelection(0)
 
-            wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-            wrap_box.Add(trigger_choice, 1, wx.ALIGN_CENTER_VERTICAL)
-            channel_box.Add(wrap_box, 0, wx.EXPAND)
+            channel_box.Add(trigger_choice, 0,
+                            wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             continuous_toggle = wx.ToggleButton(p, -1, 'One-shot')
-            wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-            wrap_box.Add(continuous_toggle, 1, wx.ALIGN_CENTER_VERTICAL)
-            channel_box.Add(wrap_box, 0, wx.EXPAND)
+            channel_box.Add(continuous_toggle, 0,
+                            wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             if oscgui_config['OSCGUI']['channel_auto_enable'] != 'yes':
                 stop_button = wx.Button(p, -1, 'Enable', style=wx.BU_EXACTFIT)
-                wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-                wrap_box.Add(stop_button, 1, wx.ALIGN_CENTER_VERTICAL)
-                channel_box.Add(wrap_box, 0, wx.EXPAND)
+                channel_box.Add(stop_button, 0,
+                                wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             trigger_button = wx.Button(p, -1, 'Trigger', style=wx.BU_EXACTFIT)
-            wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-            wrap_box.Add(trigger_button, 1, wx.ALIGN_CENTER_VERTICAL)
-            channel_box.Add(wrap_box, 0, wx.EXPAND)
+            channel_box.Add(trigger_button, 0,
+                            wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             if oscgui_config['OSCGUI']['channel_auto_enable'] == 'yes':
                 stop_button = wx.Button(p, -1, 'Stop', style=wx.BU_EXACTFIT)
-                wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-                wrap_box.Add(stop_button, 1, wx.ALIGN_CENTER_VERTICAL)
-                channel_box.Add(wrap_box, 0, wx.EXPAND)
+                channel_box.Add(stop_button, 0,
+                                wx.ALIGN_CENTER_VERTICAL | wx.EXPAND)
 
             trigger_out_check = wx.CheckBox(p, -1)
             channel_box.Add(trigger_out_check, 0, wx.ALIGN_CENTER)
 
             status_text = wx.TextCtrl(p, -1, 'Board not connected',
                                       style=wx.TE_READONLY)
-            wrap_box = wx.BoxSizer(wx.HORIZONTAL)
-            wrap_box.Add(status_text, 1, wx.ALIGN_CENTER_VERTICAL)
-            channel_box.Add(wrap_box, 0, wx.EXPAND | wx.LEFT, 5)
+            channel_box.Add(status_text, 0,
+                            wx.ALIGN_CENTER_VERTICAL | wx.EXPAND | wx.LEFT, 5)
 
             channel = ChannelCtrl(
                 ch, channel_label, waveform_choice, trigger_choice,
@@ -923,7 +1044,7 @@ class MainFrame(wx.Frame):
         right_box.Add(extra_buttons, 0, wx.EXPAND | wx.BOTTOM, 50)
 
         log_text = wx.TextCtrl(p, -1, style=wx.TE_MULTILINE | wx.TE_READONLY)
-        self.log_sh = logging.StreamHandler(log_text)
+        self.log_sh = TextCtrlHandler(log_text)
         self.log_sh.setLevel(logging.DEBUG if oscgui_config['OSCGUI']['verbose_log'] == 'yes' else logging.INFO)
         self.formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -969,6 +1090,7 @@ class MainFrame(wx.Frame):
 
         p.SetSizerAndFit(box)
         self.Fit()
+        self.Thaw()
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
     def on_save_log(self, event: wx.Event):
@@ -1106,6 +1228,8 @@ class MainFrame(wx.Frame):
                     self.device = None
                     self._dev.Close()
                     return
+                self.reset_poll_interval()
+                self.wake_daemon()
                 self.device.reset()
                 self.device.init_dac()
                 self.device.enable_dac_output()
@@ -1136,6 +1260,8 @@ class MainFrame(wx.Frame):
                 self.device.set_enable(range(12), False)
                 self._dev.Close()
                 self.device = None
+                self.reset_poll_interval()
+                self.wake_daemon()
                 self.Freeze()
                 self.device_choice.Enable()
                 self.connect_button.SetLabel('Connect')
@@ -1175,11 +1301,13 @@ class MainFrame(wx.Frame):
         self.Thaw()
 
     def on_close(self, event: wx.CloseEvent):
+        self._stop_evt.set()
         threading.Thread(target=self.on_close_worker).start()
         event.Skip()
 
     def on_close_worker(self):
         with self.daemon_lock:
+            self.wake_daemon()
             if self.connect_button.GetLabel() != 'Connect':
                 self.device.set_enable(range(12), False)
                 self._dev.Close()